@@ -8,8 +8,8 @@ import re
 
 # Add prompt_compressor to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'prompt_compressor'))
-from core.rule_based import optimize_rule_based, read_fillers
-from core.smart_reduction import optimize_smart_reduction
+from core.rule_based import optimize_rule_based, read_fillers, literal_fillers
+from core.smart_reduction import optimize_smart_reduction, compress_fast
 from core.validator import validate_compression
 from utils.co2_estimator import token_count, tokens_to_wh, per_wh
 from utils.pricing import calculate_cost_savings, MODEL_PRICING, MODEL_CATEGORIES
@@ -24,6 +24,7 @@ class CompressRequest(BaseModel):
     light_stemming: bool = False
     super_aggressive: bool = False
     encode: bool = False
+    fast: bool = False  # Single-pass compression instead of the two layers
     model_id: str = None  # Optional: LLM model for cost calculation
 
 
@@ -46,23 +47,27 @@ async def compress_endpoint(req: CompressRequest):
         # Fallback if config not found
         patterns, words, redundant_phrases, replacements, stopwords = [], [], [], {}, []
     
-    # Step 1: Enhanced rule-based compression
-    layer1 = optimize_rule_based(
-        original, 
-        patterns=patterns, 
-        words=words,
-        redundant_phrases=redundant_phrases,
-        verbose_replacements=replacements,
-        stopwords=stopwords,
-        remove_stopwords=False
-    )
-    
-    # Step 2: Smart reduction using TF-IDF
-    layer2 = optimize_smart_reduction(
-        layer1,
-        target_reduction=0.20,
-        preserve_question_structure=True
-    )
+    if req.fast:
+        # Single fused pass: literal fillers + removable words, no regex layers
+        layer1 = layer2 = compress_fast(original, literal_fillers(patterns + words))
+    else:
+        # Step 1: Enhanced rule-based compression
+        layer1 = optimize_rule_based(
+            original, 
+            patterns=patterns, 
+            words=words,
+            redundant_phrases=redundant_phrases,
+            verbose_replacements=replacements,
+            stopwords=stopwords,
+            remove_stopwords=False
+        )
+        
+        # Step 2: Smart reduction using TF-IDF
+        layer2 = optimize_smart_reduction(
+            layer1,
+            target_reduction=0.20,
+            preserve_question_structure=True
+        )
     
     # Validate compression quality
     is_valid, similarity = validate_compression(original, layer2)
@@ -1,24 +1,289 @@
+import os
 import re
+import copy
 import json
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional, Dict, Tuple
+from typing import List, Optional, Dict, Set, Tuple, Pattern, Iterator
 
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
 
-def read_fillers(path: str) -> Tuple[List[str], List[str], List[str], Dict[str, str], List[str]]:
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Greeting/politeness openings, stripped before any config-driven rules
+_GREETING_RES = [
+    re.compile(r'^(hello there[!,]?\s*)', re.I),
+    re.compile(r'^(hi there[!,]?\s*)', re.I),
+    re.compile(r'^(hey there[!,]?\s*)', re.I),
+    re.compile(r'^(greetings[!,]?\s*)', re.I),
+    re.compile(r'^\s*i hope (you\'re|you are|your) (doing )?(well|good|great)( today| this (morning|afternoon|evening))?[.,!]?\s*', re.I),
+    re.compile(r'^(can you|could you|would you|please|kindly)[:,\s]*', re.I),
+]
+
+# Whitespace and punctuation cleanup
+_RE_MULTI_WS = re.compile(r'\s+')
+_RE_SPACE_PUNCT = re.compile(r'\s+([.,!?;:])')
+_RE_MISSING_SPACE = re.compile(r'([.,!?;:])([^\s.,!?:;])')
+_RE_DUP_PUNCT = re.compile(r'([.,!?;:])\1+')
+
+# Backreferences are numbered per-pattern, so they can't share an alternation
+_RE_BACKREF = re.compile(r'\\[1-9]|\(\?P=')
+
+
+@lru_cache(maxsize=32)
+def _compile_list(patterns: Tuple[str, ...]) -> List[Optional[Pattern]]:
+    """
+    Compile config patterns once per distinct pattern list (case-insensitive).
+    Invalid patterns become None, matching the per-call re.error handling,
+    so positions still line up with the config list.
+    """
+    compiled = []
+    for pat in patterns:
+        try:
+            compiled.append(re.compile(pat, re.I))
+        except re.error:
+            compiled.append(None)
+    return compiled
+
+
+@lru_cache(maxsize=32)
+def _compile_prefilter(patterns: Tuple[str, ...]) -> Optional[Pattern]:
+    """
+    Merge the valid patterns into one alternation, used only to check whether
+    any of them matches. Removal still runs pattern by pattern: the config
+    entries (lookaheads, trailing \\b) were written for sequential application
+    and a single merged pass would remove different text.
+    Returns None if the patterns can't share an alternation.
+    """
+    valid = [pat for pat, compiled in zip(patterns, _compile_list(patterns)) if compiled is not None]
+    if not valid or any(_RE_BACKREF.search(pat) for pat in valid):
+        return None
+    try:
+        return re.compile('|'.join(f'(?:{pat})' for pat in valid), re.I)
+    except re.error:
+        # e.g. inline global flags, which are only legal at the start of a pattern
+        return None
+
+
+def compile_each(patterns: Tuple[str, ...]) -> List[Pattern]:
+    """
+    Compile each pattern separately (case-insensitive), for callers that try them one at a time.
+    Invalid patterns are skipped here, once, instead of raising re.error on every use.
+    """
+    return [pat for pat in _compile_list(patterns) if pat is not None]
+
+
+@lru_cache(maxsize=32)
+def _compile_replacements(items: Tuple[Tuple[str, str], ...]) -> List[Tuple[Pattern, str]]:
+    """Compile verbose -> short replacements once per distinct mapping."""
+    return [(re.compile(re.escape(verbose), re.I), short) for verbose, short in items]
+
+
+# Text Hyperscan's ASCII classes would read differently from Python's Unicode
+# re: anything non-ASCII, plus \x1c-\x1f, which re counts as \s.
+# (Hyperscan's Unicode mode can't compile \b, which every config entry uses.)
+_RE_HS_UNSAFE = re.compile(r'[^\x00-\x1b\x20-\x7f]')
+
+
+@lru_cache(maxsize=32)
+def _compile_hs_db(patterns: Tuple[str, ...]):
+    """
+    Compile patterns into one Hyperscan block-mode database (a single DFA scan).
+    Returns None if hyperscan isn't installed or can't compile the set
+    (e.g. lookarounds or backreferences); callers then use the re path.
+    """
+    if hyperscan is None or not patterns:
+        return None
+
+    flags = hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_SINGLEMATCH
+    db = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+    try:
+        db.compile(
+            expressions=[pat.encode('utf-8') for pat in patterns],
+            ids=list(range(len(patterns))),
+            elements=len(patterns),
+            flags=[flags] * len(patterns),
+        )
+    except Exception:
+        return None
+    return db
+
+
+def _hs_matched_ids(db, s: str) -> Set[int]:
+    """Scan once and collect the ids of the patterns that match anywhere in s."""
+    ids = set()
+
+    def on_match(pattern_id, start, end, flags, context):
+        ids.add(pattern_id)
+
+    db.scan(s.encode('utf-8'), match_event_handler=on_match)
+    return ids
+
+
+def _remove_patterns(s: str, patterns: Tuple[str, ...]) -> str:
+    """Delete every match of the given patterns, in config order."""
+    db = _compile_hs_db(patterns)
+    if db is not None and not _RE_HS_UNSAFE.search(s):
+        # Hyperscan only tells which entries occur; the re subs still do the
+        # removal, so the output is the same with or without it installed
+        matched = _hs_matched_ids(db, s)
+        for i, pat in enumerate(_compile_list(patterns)):
+            if i not in matched or pat is None:
+                continue
+            removed = pat.sub('', s)
+            if removed != s:
+                s = removed
+                # Deleting text can create matches for later entries
+                matched = _hs_matched_ids(db, s)
+        return s
+
+    # Most prompts contain none of a list's entries; one scan settles that
+    prefilter = _compile_prefilter(patterns)
+    if prefilter is not None and not prefilter.search(s):
+        return s
+
+    for pat in compile_each(patterns):
+        s = pat.sub('', s)
+    return s
+
+
+def deletions_in_order(s: str, patterns: Tuple[str, ...]) -> Iterator[str]:
+    """
+    Yield s with each pattern's matches deleted, one candidate per pattern, in list order.
+    With Hyperscan the text is scanned once for all patterns, and patterns with
+    no match yield s unchanged without a re pass. Lazy, so callers that stop at
+    the first acceptable candidate skip the remaining deletions.
+    """
+    db = _compile_hs_db(patterns)
+    matched = _hs_matched_ids(db, s) if db is not None and not _RE_HS_UNSAFE.search(s) else None
+
+    for i, pat in enumerate(_compile_list(patterns)):
+        if pat is None:
+            continue
+        if matched is not None and i not in matched:
+            yield s
+        else:
+            # Same re sub as without Hyperscan, so candidates don't depend on it
+            yield pat.sub('', s)
+
+
+# A config entry that is just one word between word boundaries, e.g. "\\bactually\\b"
+_RE_LITERAL_WORD = re.compile(r"^\\b(\w(?:[\w']*\w)?)\\b$")
+
+
+@lru_cache(maxsize=32)
+def _split_literal_words(words: Tuple[str, ...]) -> Tuple[Optional[str], ...]:
+    """The plain word of each config entry, or None for entries that aren't one."""
+    literals = []
+    for pat in words:
+        m = _RE_LITERAL_WORD.match(pat)
+        literals.append(m.group(1) if m else None)
+    return tuple(literals)
+
+
+@lru_cache(maxsize=32)
+def _build_automaton(literals: Tuple[str, ...]):
+    """Aho-Corasick automaton over the casefolded plain words, or None if pyahocorasick isn't installed."""
+    if ahocorasick is None or not literals:
+        return None
+    automaton = ahocorasick.Automaton()
+    for word in literals:
+        folded = word.casefold()
+        automaton.add_word(folded, folded)
+    automaton.make_automaton()
+    return automaton
+
+
+def _remove_words(s: str, words: Tuple[str, ...]) -> str:
+    """
+    Delete filler words in config order, like _remove_patterns.
+    One Aho-Corasick sweep finds which plain-word entries occur in the text, and
+    entries that don't are skipped instead of running their regex. The sweep
+    only looks for substrings, so it can over-report but never misses a match.
+    Falls back to the pattern path if pyahocorasick is missing.
+    """
+    literals = _split_literal_words(words)
+    automaton = _build_automaton(tuple(word for word in literals if word is not None))
+    if automaton is None:
+        return _remove_patterns(s, words)
+
+    present = None
+    for pat, word in zip(_compile_list(words), literals):
+        if pat is None:
+            continue
+        if word is not None:
+            if present is None:
+                present = {found for _, found in automaton.iter(s.casefold())}
+            if word.casefold() not in present:
+                continue
+        removed = pat.sub('', s)
+        if removed != s:
+            s = removed
+            # Deleting text can create matches for later entries; sweep again when needed
+            present = None
+    return s
+
+
+@lru_cache(maxsize=32)
+def _literal_fillers(patterns: Tuple[str, ...]) -> frozenset:
+    return frozenset(word.lower() for word in _split_literal_words(patterns) if word is not None)
+
+
+def literal_fillers(patterns: List[str]) -> frozenset:
+    """
+    Extract the plain single-word entries from config patterns.
+    Used by the single-pass compressor, which matches words by set lookup instead of regex.
+    Cached per distinct pattern list, like the compiled regexes.
+    """
+    return _literal_fillers(tuple(patterns))
+
+
+@lru_cache(maxsize=4)
+def _load_fillers(path: str, mtime: float) -> dict:
+    """Parse the config; keyed on mtime so edits to the file are picked up."""
+    raw = Path(path).read_bytes()
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw.decode('utf-8'))
+
+
+def load_fillers_config(path: str) -> dict:
+    """
+    Load the raw fillers JSON config.
+    The parse is cached until the file's modification time changes; callers
+    get a deep copy, so modifying it can't leak into later calls.
+    """
+    return copy.deepcopy(_load_fillers(path, os.path.getmtime(path)))
+
+
+def read_fillers(path: str) -> Tuple[Tuple[str, ...], Tuple[str, ...], Tuple[str, ...], Dict[str, str], Tuple[str, ...]]:
     """
     Read filler patterns from JSON config.
     
     Returns:
         (patterns, words, redundant_phrases, verbose_replacements, stopwords)
+        Lists come back as tuples and the replacements as a fresh dict,
+        so the cached config can't be modified through them.
     """
-    p = Path(path)
-    data = json.loads(p.read_text(encoding='utf-8'))
+    data = _load_fillers(path, os.path.getmtime(path))
     
-    patterns = data.get('patterns', [])
-    words = data.get('words', [])
-    redundant_phrases = data.get('redundant_phrases', [])
-    verbose_replacements = data.get('verbose_replacements', {})
-    stopwords = data.get('stopwords', [])
+    patterns = tuple(data.get('patterns', ()))
+    words = tuple(data.get('words', ()))
+    redundant_phrases = tuple(data.get('redundant_phrases', ()))
+    verbose_replacements = dict(data.get('verbose_replacements', {}))
+    stopwords = tuple(data.get('stopwords', ()))
     
     return patterns, words, redundant_phrases, verbose_replacements, stopwords
 
@@ -65,53 +330,33 @@ def optimize_rule_based(
     s = text.strip()
 
     # Step 1: Remove greeting/politeness openings
-    s = re.sub(r'^(hello there[!,]?\s*)', '', s, flags=re.I)
-    s = re.sub(r'^(hi there[!,]?\s*)', '', s, flags=re.I)
-    s = re.sub(r'^(hey there[!,]?\s*)', '', s, flags=re.I)
-    s = re.sub(r'^(greetings[!,]?\s*)', '', s, flags=re.I)
-    s = re.sub(r'^\s*i hope (you\'re|you are|your) (doing )?(well|good|great)( today| this (morning|afternoon|evening))?[.,!]?\s*', '', s, flags=re.I)
-    s = re.sub(r'^(can you|could you|would you|please|kindly)[:,\s]*', '', s, flags=re.I)
+    for greeting in _GREETING_RES:
+        s = greeting.sub('', s)
 
     # Step 2: Apply verbose replacements (before removal to avoid conflicts)
-    for verbose, short in verbose_replacements.items():
-        s = re.sub(re.escape(verbose), short, s, flags=re.I)
+    for verbose, short in _compile_replacements(tuple(verbose_replacements.items())):
+        s = verbose.sub(short, s)
 
     # Step 3: Remove filler patterns
-    for pat in patterns:
-        try:
-            s = re.sub(pat, '', s, flags=re.I)
-        except re.error:
-            continue
+    s = _remove_patterns(s, tuple(patterns))
 
     # Step 4: Remove filler words
-    for word in words:
-        try:
-            s = re.sub(word, '', s, flags=re.I)
-        except re.error:
-            continue
+    s = _remove_words(s, tuple(words))
 
     # Step 5: Remove redundant phrases
-    for phrase in redundant_phrases:
-        try:
-            s = re.sub(phrase, '', s, flags=re.I)
-        except re.error:
-            continue
+    s = _remove_patterns(s, tuple(redundant_phrases))
 
     # Step 6: Optional stopword removal
     if remove_stopwords:
-        for stopword in stopwords:
-            try:
-                s = re.sub(stopword, '', s, flags=re.I)
-            except re.error:
-                continue
+        s = _remove_patterns(s, tuple(stopwords))
 
     # Step 7: Clean up whitespace and punctuation
-    s = re.sub(r'\s+', ' ', s)
-    s = re.sub(r'\s+([.,!?;:])', r'\1', s)
-    s = re.sub(r'([.,!?;:])([^\s.,!?:;])', r'\1 \2', s)
+    s = _RE_MULTI_WS.sub(' ', s)
+    s = _RE_SPACE_PUNCT.sub(r'\1', s)
+    s = _RE_MISSING_SPACE.sub(r'\1 \2', s)
     
     # Step 8: Remove duplicate punctuation
-    s = re.sub(r'([.,!?;:])\1+', r'\1', s)
+    s = _RE_DUP_PUNCT.sub(r'\1', s)
     
     # Step 9: Clean leading/trailing
     s = s.strip(' \n\t\r"')
@@ -11,9 +11,26 @@ Method: Linguistic rules + part-of-speech patterns
 """
 
 import re
+from collections import Counter
 from typing import List, Tuple, Set
 
 
+# Tokenization
+_RE_TOKEN = re.compile(r"(?P<word>\w+'\w+|\w+)|(?P<other>[^\w\s]|\s+)")
+_RE_WORD = re.compile(r'\b\w+\b')
+_RE_CAPITALIZED = re.compile(r'\b[A-Z][A-Za-z0-9]*\b')
+_RE_NUMBER = re.compile(r'^\d+$')
+_RE_NUMBER_UNIT = re.compile(r'^\d+[a-z]*$')
+
+# Final cleanup of the rebuilt text
+# Whitespace run, plus the punctuation right after it (if any)
+_RE_WS_PUNCT = re.compile(r'\s+([.,!?;:])?')
+_RE_DUP_PUNCT = re.compile(r'([.,!?;:])\s*([.,!?;:])')
+_RE_MISSING_SPACE = re.compile(r'([.,!?;:])([a-zA-Z])')
+_RE_ORPHAN_PREFIX = re.compile(r'^(?:\w+\'?\w*\s+){1,6}(One|The|That|Different|Sources|I)')
+_RE_COVER_COLON = re.compile(r'\b(Cover)\s+(?=[A-Za-z0-9])')
+
+
 def _split_into_words(text: str) -> List[Tuple[str, bool]]:
     """
     Split text into words while preserving structure.
@@ -25,18 +42,24 @@ def _split_into_words(text: str) -> List[Tuple[str, bool]]:
     # \w+ matches regular words
     # [^\w\s] matches punctuation
     # \s+ matches whitespace
-    pattern = r"(\w+'\w+|\w+|[^\w\s]|\s+)"
-    tokens = re.findall(pattern, text)
-    
-    result = []
-    for token in tokens:
-        # Check if it's a word (including contractions)
-        if re.match(r"\w+('\w+)?", token):
-            result.append((token, True))  # It's a word
-        else:
-            result.append((token, False))  # It's punctuation/whitespace
-    
-    return result
+    # The matching group tells words (including contractions) from punctuation/whitespace
+    return [(m.group(), m.lastgroup == 'word') for m in _RE_TOKEN.finditer(text)]
+
+
+# Words that can be safely removed without losing core meaning.
+_REMOVABLE_WORDS = frozenset({
+    # Articles (can be removed in most cases)
+    'a', 'an', 'the',
+    # Weak modifiers
+    'very', 'quite', 'rather', 'somewhat', 'fairly',
+    # Redundant prepositions in lists (but NOT all prepositions!)
+    'on', 'in', 'at', 'of',  
+    # Pronouns in impersonal prompts
+    'it', 'this', 'that',
+})
+
+# Technical suffixes suggest domain terms
+_DOMAIN_SUFFIXES = ('tion', 'ment', 'ness', 'ity', 'ance', 'ence', 'ization')
 
 
 def _get_removable_words() -> Set[str]:
@@ -44,16 +67,7 @@ def _get_removable_words() -> Set[str]:
     Words that can be safely removed without losing core meaning.
     These are articles, weak modifiers, and redundant conjunctions.
     """
-    return {
-        # Articles (can be removed in most cases)
-        'a', 'an', 'the',
-        # Weak modifiers
-        'very', 'quite', 'rather', 'somewhat', 'fairly',
-        # Redundant prepositions in lists (but NOT all prepositions!)
-        'on', 'in', 'at', 'of',  
-        # Pronouns in impersonal prompts
-        'it', 'this', 'that',
-    }
+    return _REMOVABLE_WORDS
 
 
 def _is_noun_phrase_connector(word: str) -> bool:
@@ -78,61 +92,47 @@ def _get_word_importance_scores(text: str, global_context: List[str] = None) ->
         Dictionary mapping words (lowercase) to importance scores (0-1)
         Higher score = more important = keep it
     """
-    words_in_text = re.findall(r'\b\w+\b', text.lower())
+    words_in_text = _RE_WORD.findall(text.lower())
+    if not words_in_text:
+        return {}
+
+    word_freq = Counter(words_in_text)
+    first_word = words_in_text[0]
+    leading_words = set(words_in_text[:6])
+    capitalized = {match.group().lower() for match in _RE_CAPITALIZED.finditer(text)}
+
     word_scores = {}
-    
-    # Baseline: assume all words are important until proven otherwise
-    for word in set(words_in_text):
-        word_scores[word] = 0.7
-    
-    # === REMOVABLE WORDS (low importance) ===
-    removable = _get_removable_words()
-    for word in removable:
-        if word in word_scores:
-            word_scores[word] = 0.2  # Low importance but not zero (context matters)
-    
-    # === BOOST IMPORTANT WORDS ===
-    
-    # 1. Action verbs at sentence start (directives)
-    imperative_verbs = IMPERATIVE_VERBS
-    if words_in_text and words_in_text[0] in imperative_verbs:
-        word_scores[words_in_text[0]] = 1.0  # Maximum importance
-    
-    # 2. Structural keywords
-    for word in STRUCTURE_WORDS:
-        if word in word_scores:
-            word_scores[word] = 0.95
-    
-    # 3. Capitalized words in original text (proper nouns, acronyms, important terms)
-    for match in re.finditer(r'\b[A-Z][A-Za-z0-9]*\b', text):
-        word = match.group().lower()
-        if word in word_scores:
-            word_scores[word] = 0.9
-    
-    # 4. Numbers and dates (always important context)
-    for word in words_in_text:
-        if re.match(r'^\d+$', word) or re.match(r'^\d+[a-z]+$', word):  # "6month", "1M"
-            word_scores[word] = 0.95
-    
-    # 5. Domain-specific terms (compound words, hyphenated, technical suffixes)
-    for word in words_in_text:
-        # Technical suffixes suggest domain terms
-        if any(word.endswith(suf) for suf in ['tion', 'ment', 'ness', 'ity', 'ance', 'ence', 'ization']):
-            word_scores[word] = max(word_scores.get(word, 0), 0.85)
-    
-    # 6. First few words often contain core topic - boost them
-    for i, word in enumerate(words_in_text[:6]):
-        if word not in removable:  # Don't boost articles even if they're first
-            word_scores[word] = max(word_scores.get(word, 0), 0.85)
-    
-    # 7. Words that appear multiple times = key concepts
-    word_freq = {}
-    for word in words_in_text:
-        word_freq[word] = word_freq.get(word, 0) + 1
     for word, count in word_freq.items():
-        if count >= 2 and word not in removable:
-            word_scores[word] = max(word_scores.get(word, 0), 0.9)
-    
+        # Base score: later rules override earlier ones
+        if _RE_NUMBER_UNIT.match(word):
+            # Numbers and dates (always important context): "6month", "1M"
+            score = 0.95
+        elif word in capitalized:
+            # Capitalized in original text (proper nouns, acronyms, important terms)
+            score = 0.9
+        elif word in STRUCTURE_WORDS:
+            score = 0.95
+        elif word == first_word and word in IMPERATIVE_VERBS:
+            # Action verb at sentence start (directive)
+            score = 1.0
+        elif word in _REMOVABLE_WORDS:
+            score = 0.2  # Low importance but not zero (context matters)
+        else:
+            score = 0.7  # Assume words are important until proven otherwise
+
+        # Boosts only ever raise the score
+        if word.endswith(_DOMAIN_SUFFIXES):
+            score = max(score, 0.85)
+        if word not in _REMOVABLE_WORDS:
+            # First few words often contain core topic
+            if word in leading_words:
+                score = max(score, 0.85)
+            # Words that appear multiple times = key concepts
+            if count >= 2:
+                score = max(score, 0.9)
+
+        word_scores[word] = score
+
     return word_scores
 
 
@@ -177,7 +177,7 @@ def _is_important_word(word: str, pos_in_sentence: str = 'middle') -> bool:
         return True
     
     # Always preserve numbers
-    if re.match(r'^\d+$', word):
+    if _RE_NUMBER.match(word):
         return True
     
     # Preserve technical/specific terms (capitalized mid-sentence, CamelCase, acronyms)
@@ -259,7 +259,6 @@ def optimize_smart_reduction(
     
     # Score each word
     word_importance = []
-    first_sentence_end = text.find('.') if '. ' in text or text.endswith('.') else len(text)
     
     for ordinal, (i, word) in enumerate(word_tokens):
         token_pos = i
@@ -277,12 +276,6 @@ def optimize_smart_reduction(
             words_to_keep.add(i)
             continue
         
-        # Preserve first sentence if it's short (likely contains important context/greeting)
-        word_char_pos = sum(len(tokens[j][0]) for j in range(i))
-        if word_char_pos < first_sentence_end and first_sentence_end < 100:
-            # First sentence is short - might be greeting, preserve some structure
-            pass  # Let TF-IDF decide but don't force keep
-        
         # Check if it's the last word in a question
         if is_question and preserve_question_structure and i == word_tokens[-1][0]:
             words_to_keep.add(i)
@@ -316,20 +309,117 @@ def optimize_smart_reduction(
     result = ' '.join(kept_tokens)
     
     # Clean up spacing and punctuation
-    result = re.sub(r'\s+', ' ', result)  # Multiple spaces → single space
-    result = re.sub(r'\s+([.,!?;:])', r'\1', result)  # Remove space before punctuation
-    result = re.sub(r'([.,!?;:])\s*([.,!?;:])', r'\1', result)  # Remove duplicate punctuation
-    result = re.sub(r'([.,!?;:])([a-zA-Z])', r'\1 \2', result)  # Add space after punctuation if missing
+    # Multiple spaces → single space, and drop the space before punctuation, in one pass
+    result = _RE_WS_PUNCT.sub(lambda m: m.group(1) or ' ', result)
+    result = _RE_DUP_PUNCT.sub(r'\1', result)  # Remove duplicate punctuation
+    result = _RE_MISSING_SPACE.sub(r'\1 \2', result)  # Add space after punctuation if missing
     
     # Remove broken fragments at start (orphaned contractions, single words before main content)
     # Pattern: remove sequences like "I'm for I've how" before meaningful text starts
-    result = re.sub(r'^(?:\w+\'?\w*\s+){1,6}(One|The|That|Different|Sources|I)', r'\1', result)
+    result = _RE_ORPHAN_PREFIX.sub(r'\1', result)
     
     # Ensure 'Cover:' keeps colon if followed by list (may have been detached)
-    result = re.sub(r'\b(Cover)\s+(?=[A-Za-z0-9])', r'\1: ', result)
+    result = _RE_COVER_COLON.sub(r'\1: ', result)
 
     # Capitalize first letter
     if result:
         result = result[0].upper() + result[1:]
     
     return result.strip()
+
+
+_SENTENCE_END = frozenset('.!?')
+_CLAUSE_PUNCT = frozenset('.,!?;:')
+# Special characters _is_important_word keeps words for (paths, emails, compounds);
+# a dot only counts inside a word (a.txt), not as sentence punctuation
+_SPECIAL_CHARS = frozenset('_-@/')
+
+
+def _inside_word(text: str, start: int, end: int) -> bool:
+    """True if text[start:end] sits between two word characters, as in 'x.txt' or '3.14'."""
+    return 0 < start and end < len(text) and text[start - 1].isalnum() and text[end].isalnum()
+
+
+def _touches_special_char(text: str, start: int, end: int) -> bool:
+    """True if text[start:end] is glued to a special character, as 'a' in 'a/b' or 'a.txt'."""
+    for i in (start - 1, end):
+        if 0 <= i < len(text):
+            c = text[i]
+            if c in _SPECIAL_CHARS or (c == '.' and _inside_word(text, i, i + 1)):
+                return True
+    return False
+
+
+def compress_fast(
+    text: str,
+    fillers: frozenset = frozenset(),
+    removable: frozenset = _REMOVABLE_WORDS
+) -> str:
+    """
+    Single-pass compression: tokenize once and emit kept tokens directly.
+    
+    Fuses the filler removal, tidy-up and removable-word steps of the
+    layered pipeline into one walk over the text. Only single-word fillers
+    are handled (see rule_based.literal_fillers); multi-word and regex
+    fillers, scoring and the reduction target are skipped.
+    
+    Args:
+        text: Input text
+        fillers: Lowercase filler words to drop
+        removable: Lowercase low-value words to drop unless _is_important_word keeps them
+                   or they are glued to a special character (part of a path, email, ...)
+    
+    Returns:
+        Compressed text
+    """
+    if not text or not text.strip():
+        return text
+
+    out = []
+    pending_space = False
+    sentence_start = True
+    after_punct = False  # last emitted token was clause punctuation
+
+    for m in _RE_TOKEN.finditer(text):
+        token = m.group()
+
+        if m.lastgroup == 'word':
+            lower = token.lower()
+            if lower in fillers:
+                continue
+            if (lower in removable
+                    and not _is_important_word(token, 'first' if sentence_start else 'middle')
+                    and not _touches_special_char(text, m.start(), m.end())):
+                continue
+            if out and (pending_space or after_punct):
+                out.append(' ')
+            out.append(token)
+            pending_space = False
+            after_punct = False
+            sentence_start = False
+        elif token.isspace():
+            pending_space = True
+        elif token in _CLAUSE_PUNCT and not _inside_word(text, m.start(), m.end()):
+            # No leading punctuation, no space before it, no runs of it
+            if not out or after_punct:
+                continue
+            out.append(token)
+            pending_space = False
+            after_punct = True
+            if token in _SENTENCE_END:
+                sentence_start = True
+        else:
+            # Other symbols (hyphens, quotes, slashes, in-word dots) keep their spacing
+            if out and pending_space:
+                out.append(' ')
+            out.append(token)
+            pending_space = False
+            after_punct = False
+
+    result = ''.join(out)
+
+    # Capitalize first letter
+    if result:
+        result = result[0].upper() + result[1:]
+
+    return result
@@ -6,18 +6,16 @@ Uses cosine similarity to compare original and compressed text.
 """
 
 from typing import Tuple
-from sentence_transformers import SentenceTransformer
-import numpy as np
 
-# Load model once at module level
-_model = None
+try:
+    import torch.nn.functional as F
+    _HAS_TORCH = True
+except Exception:
+    F = None
+    _HAS_TORCH = False
 
-def get_model():
-    """Get or initialize the sentence transformer model."""
-    global _model
-    if _model is None:
-        _model = SentenceTransformer('all-MiniLM-L6-v2')
-    return _model
+# Share the extractive layer's model cache so MiniLM is only loaded once per process
+from .extractive import get_model, encode_cached
 
 
 def calculate_semantic_similarity(text1: str, text2: str) -> float:
@@ -37,21 +35,19 @@ def calculate_semantic_similarity(text1: str, text2: str) -> float:
     # Same text = perfect similarity
     if text1.strip().lower() == text2.strip().lower():
         return 1.0
-    
-    model = get_model()
+
+    model = get_model() if _HAS_TORCH else None
     if model is None:
         # If model unavailable, assume OK
         return 1.0
     
     try:
-        from sentence_transformers import util
-        
-        # Get embeddings
-        emb1 = model.encode([text1], convert_to_tensor=True)
-        emb2 = model.encode([text2], convert_to_tensor=True)
+        # Get embeddings - cached, uncached texts share one batched forward pass
+        emb = encode_cached(model, [text1, text2])
         
-        # Calculate cosine similarity
-        similarity = util.cos_sim(emb1, emb2)[0][0].item()
+        # Calculate cosine similarity - dot product of the unit-normalized pair
+        emb = F.normalize(emb, dim=-1)
+        similarity = (emb[0] @ emb[1]).item()
         
         return float(similarity)
     
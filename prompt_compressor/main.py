@@ -1,12 +1,10 @@
 
 import sys
 import time
-import psutil
-import os
 import re
-from core.rule_based import optimize_rule_based, read_fillers
-from core.smart_reduction import optimize_smart_reduction
-from utils.co2_estimator import token_count, tokens_to_wh, per_wh
+from core.rule_based import optimize_rule_based, read_fillers, literal_fillers, load_fillers_config, deletions_in_order
+from core.smart_reduction import optimize_smart_reduction, compress_fast
+from utils.co2_estimator import token_count, tokens_to_wh, get_carbon_intensity
 from core.validator import validate_compression
 from utils.pricing import (
     get_model_list, 
@@ -18,7 +16,50 @@ from utils.pricing import (
 )
 
 
-def run(prompt: str, model_id: str = None):
+# tidy_text patterns
+_RE_PUNCT_RUN = re.compile(r"[\.!?]{2,}")
+_RE_LEAD_NONWORD = re.compile(r"^[^\w]+")
+# Punctuation with any space before it, and the glued character after it (if any)
+_RE_PUNCT_SPACING = re.compile(r"\s*([\.,!?:;])(?=([^\s\.,!?:;])?)")
+# Leading "you could / I need to ..." phrases. The optional groups run in the
+# same order the separate anchored subs used to, so stacked phrases still strip.
+_RE_LEAD_PHRASES = re.compile(
+    r"^(?:you could )?(?:you would )?(?:you can )?(?:you should )?(?:I need to )?(?:I want to )?",
+    re.I,
+)
+
+# Anything the four punctuation passes in tidy_text would change
+_RE_TIDY_DIRTY = re.compile(r"[\.!?]{2}|\s[\.,!?:;]|[\.,!?:;][^\s\.,!?:;]")
+
+# Last-resort fallback: drop a trailing clause after a separator
+_RE_TRAILING_CLAUSE = re.compile(r"[,;:\-]\s*(and|for|that|which|please|include)\b.*$", re.I)
+
+
+def tidy_text(s: str) -> str:
+    if not s:
+        return s
+    s = s.strip()
+
+    # Fast path: already-clean text (the common second call) skips the punctuation passes
+    if not (s[:1].isalnum() and not _RE_TIDY_DIRTY.search(s)):
+        s = _RE_PUNCT_RUN.sub(lambda m: m.group(0)[0], s)
+        if not s[:1].isalnum():
+            s = _RE_LEAD_NONWORD.sub('', s)
+        # Drop the space before punctuation and add one after it, in one pass
+        s = _RE_PUNCT_SPACING.sub(lambda m: m.group(1) + ' ' if m.group(2) else m.group(1), s)
+    
+    # Grammar cleanup
+    s = _RE_LEAD_PHRASES.sub("", s, count=1)
+    
+    # Capitalize first letter if it's lowercase
+    if s and s[0].islower():
+        s = s[0].upper() + s[1:]
+    
+    s = s.rstrip()
+    return s
+
+
+def run(prompt: str, model_id: str = None, fast: bool = False):
     original = prompt.strip()
     if not original:
         print('No prompt provided.')
@@ -31,106 +72,76 @@ def run(prompt: str, model_id: str = None):
         return
 
     # Start tracking compression energy
-    process = psutil.Process(os.getpid())
     compression_start_time = time.time()
-    compression_start_cpu = process.cpu_percent(interval=0.1)
-
-    # Step 1: Enhanced rule-based compression
-    cleaned = optimize_rule_based(
-        original, 
-        patterns=patterns, 
-        words=words,
-        redundant_phrases=redundant_phrases,
-        verbose_replacements=replacements,
-        stopwords=stopwords,
-        remove_stopwords=False  # Can be made configurable
-    )
+    compression_start_cpu_t = time.process_time()
 
-    def tidy_text(s: str) -> str:
-        if not s:
-            return s
-        s = s.strip()
-        s = re.sub(r"[\.!?]{2,}", lambda m: m.group(0)[0], s)
-        s = re.sub(r"^[^\w]+", '', s)
-        s = re.sub(r"\s+([\.,!?:;])", r"\1", s)
-        s = re.sub(r"([\.,!?:;])([^\s\.,!?:;])", r"\1 \2", s)
-        
-        # Grammar cleanup
-        s = re.sub(r"^you could ", "", s, flags=re.I)
-        s = re.sub(r"^you would ", "", s, flags=re.I)
-        s = re.sub(r"^you can ", "", s, flags=re.I)
-        s = re.sub(r"^you should ", "", s, flags=re.I)
-        s = re.sub(r"^I need to ", "", s, flags=re.I)
-        s = re.sub(r"^I want to ", "", s, flags=re.I)
-        
-        # Capitalize first letter if it's lowercase
-        if s and s[0].islower():
-            s = s[0].upper() + s[1:]
-        
-        s = s.rstrip()
-        return s
-
-    cleaned = tidy_text(cleaned)
+    if fast:
+        # Single fused pass: literal fillers + removable words, no regex layers
+        cleaned = compress_fast(original, literal_fillers(patterns + words))
+        compressed = cleaned
+    else:
+        # Step 1: Enhanced rule-based compression
+        cleaned = optimize_rule_based(
+            original, 
+            patterns=patterns, 
+            words=words,
+            redundant_phrases=redundant_phrases,
+            verbose_replacements=replacements,
+            stopwords=stopwords,
+            remove_stopwords=False  # Can be made configurable
+        )
+        cleaned = tidy_text(cleaned)
 
-    # Step 2: Smart reduction using TF-IDF
-    compressed = optimize_smart_reduction(cleaned, target_reduction=0.20, preserve_question_structure=True)
-    compressed = tidy_text(compressed)
+        # Step 2: Smart reduction using TF-IDF
+        compressed = optimize_smart_reduction(cleaned, target_reduction=0.20, preserve_question_structure=True)
+        compressed = tidy_text(compressed)
     
     orig_tokens = token_count(original)
     compressed_tokens = token_count(compressed)
-    
+
     # Fallback: if compression ratio is low, try aggressive patterns
     if compressed_tokens >= orig_tokens * 0.95:  # Less than 5% compression
         aggressive_patterns = []
         try:
-            import json
-            from pathlib import Path
-            p = Path('config/fillers.json')
-            if p.exists():
-                data = json.loads(p.read_text(encoding='utf-8'))
-                aggressive_patterns = data.get('aggressive', [])
+            # Same cached parse read_fillers used above - no second file read
+            aggressive_patterns = load_fillers_config('config/fillers.json').get('aggressive', [])
         except Exception:
             aggressive_patterns = []
 
         aggressive_result = None
-        for pat in aggressive_patterns:
-            try:
-                candidate = re.sub(pat, '', cleaned, flags=re.I)
-                candidate = tidy_text(candidate)
-                if token_count(candidate) < compressed_tokens:
-                    aggressive_result = candidate
-                    compressed = candidate
-                    compressed_tokens = token_count(compressed)
-                    break
-            except re.error:
-                continue
+        # One scan for all patterns; candidates are still tried in config order, first win kept
+        for candidate in deletions_in_order(cleaned, tuple(aggressive_patterns)):
+            candidate = tidy_text(candidate)
+            candidate_tokens = token_count(candidate)
+            if candidate_tokens < compressed_tokens:
+                aggressive_result = candidate
+                compressed = candidate
+                compressed_tokens = candidate_tokens
+                break
 
         if aggressive_result is None:
-            candidate = re.sub(r"[,;:\-]\s*(and|for|that|which|please|include)\b.*$", '', cleaned, flags=re.I)
+            candidate = _RE_TRAILING_CLAUSE.sub('', cleaned)
             candidate = tidy_text(candidate)
-            if token_count(candidate) < compressed_tokens:
+            candidate_tokens = token_count(candidate)
+            if candidate_tokens < compressed_tokens:
                 compressed = candidate
-                compressed_tokens = token_count(compressed)
+                compressed_tokens = candidate_tokens
 
     # Calculate compression energy cost
     compression_end_time = time.time()
-    compression_end_cpu = process.cpu_percent(interval=0.1)
+    compression_end_cpu_t = time.process_time()
     
     compression_time_sec = compression_end_time - compression_start_time
-    avg_cpu_percent = (compression_start_cpu + compression_end_cpu) / 2
+    cpu_seconds = compression_end_cpu_t - compression_start_cpu_t
     
-    # Estimate compression energy: CPU power × time
-    # Assuming ~15W CPU base power, scaled by usage
-    cpu_power_watts = 15 * (avg_cpu_percent / 100)
-    compression_energy_wh = (cpu_power_watts * compression_time_sec) / 3600
+    # Estimate compression energy: CPU power × CPU time actually consumed
+    # Assuming ~15W CPU base power
+    compression_energy_wh = (15.0 * cpu_seconds) / 3600
 
     # Semantic validation - ensure we didn't destroy meaning
     is_valid, similarity = validate_compression(original, compressed, min_similarity=0.75)
 
-    # Token and CO2 calculations
-    orig_tokens = token_count(original)
-    cleaned_tokens = token_count(cleaned)
-    compressed_tokens = token_count(compressed)
+    # Token and CO2 calculations (counts from the fallback gate, kept current above)
     tokens_saved = max(0, orig_tokens - compressed_tokens)
     
     # LLM energy saved
@@ -140,12 +151,13 @@ def run(prompt: str, model_id: str = None):
     net_energy_saved_wh = llm_energy_saved_wh - compression_energy_wh
     
     # Get carbon intensity from API (with fallback)
-    from utils.co2_estimator import get_carbon_intensity
     carbon_intensity = get_carbon_intensity()
     
     # CO2 calculations
-    llm_co2_saved = per_wh(llm_energy_saved_wh)
-    compression_co2_cost = per_wh(compression_energy_wh)
+    # Wh -> kWh -> g CO2, same math as per_wh with the intensity fetched once
+    g_per_wh = carbon_intensity / 1000.0
+    llm_co2_saved = llm_energy_saved_wh * g_per_wh
+    compression_co2_cost = compression_energy_wh * g_per_wh
     net_co2_saved = llm_co2_saved - compression_co2_cost
 
     print('\nCAPO Metrics:')
@@ -258,6 +270,8 @@ def _select_model() -> str:
 
 
 if __name__ == '__main__':
+    # --fast: single-pass compression instead of the two layers
+    fast = '--fast' in sys.argv[1:]
     model_id = _select_model()
     prompt = _read_prompt_from_stdin_or_input()
-    run(prompt, model_id)
+    run(prompt, model_id, fast=fast)
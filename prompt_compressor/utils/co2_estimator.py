@@ -1,28 +1,65 @@
-from typing import Optional
+from typing import Optional, Dict, Tuple
+from functools import lru_cache
 import os
+import time
+import atexit
 import requests
 from datetime import datetime
 
 
-def token_count(text: str) -> int:
-    try:
-        import tiktoken
-    except Exception as e:
-        raise RuntimeError('tiktoken is required for accurate token counting. Please install it.') from e
+# Global encoder cache - building the BPE ranks is expensive, do it once
+_CACHED_ENCODER = None
+
+
+def _get_encoder():
+    """
+    Get or load the tiktoken encoder.
+    Caches the encoder globally so only the first token_count call pays the load cost.
+    """
+    global _CACHED_ENCODER
+
+    if _CACHED_ENCODER is None:
+        try:
+            import tiktoken
+        except Exception as e:
+            raise RuntimeError('tiktoken is required for accurate token counting. Please install it.') from e
+
+        try:
+            _CACHED_ENCODER = tiktoken.get_encoding('cl100k_base')
+        except Exception:
+            _CACHED_ENCODER = tiktoken.get_encoding('gpt2')
+
+    return _CACHED_ENCODER
 
-    try:
-        enc = tiktoken.get_encoding('cl100k_base')
-    except Exception:
-        enc = tiktoken.get_encoding('gpt2')
+
+# Repeats are common: patterns the aggressive fallback finds no match for all
+# yield the same candidate, and /compress counts layer1 == layer2 in fast mode
+@lru_cache(maxsize=512)
+def token_count(text: str) -> int:
+    enc = _get_encoder()
 
     if not text:
         return 0
     return len(enc.encode(text))
 
 
+# Persistent HTTP session - keeps the TLS connection to Electricity Maps alive between calls
+_SESSION = requests.Session()
+_SESSION.headers.update({'User-Agent': 'GreenTok/1.0'})
+atexit.register(_SESSION.close)
+
+# Carbon intensity cache - zone -> (expires at, gCO2eq/kWh); grid mix changes slowly
+_CI_CACHE: Dict[str, Tuple[float, float]] = {}
+CI_CACHE_TTL_SEC = 900
+# A failed API request is retried after this long instead of pinning the fallback
+CI_FAILURE_TTL_SEC = 60
+
+
 def get_carbon_intensity(zone: str = 'US-CAL-CISO') -> Optional[float]:
     """
     Fetch real-time carbon intensity from Electricity Maps API.
+    Results are cached per zone for CI_CACHE_TTL_SEC; fallbacks used because
+    the API request failed only for CI_FAILURE_TTL_SEC.
     
     Args:
         zone: Geographic zone code (e.g., 'US-CAL-CISO', 'GB', 'DE', 'FR')
@@ -32,6 +69,24 @@ def get_carbon_intensity(zone: str = 'US-CAL-CISO') -> Optional[float]:
     Returns:
         Carbon intensity in gCO2eq/kWh
     """
+    cached = _CI_CACHE.get(zone)
+    if cached is not None and time.monotonic() < cached[0]:
+        return cached[1]
+
+    value = _fetch_carbon_intensity(zone)
+    ttl = CI_CACHE_TTL_SEC
+    if value is None:
+        value = get_fallback_carbon_intensity(zone)
+        ttl = CI_FAILURE_TTL_SEC
+    _CI_CACHE[zone] = (time.monotonic() + ttl, value)
+    return value
+
+
+def _fetch_carbon_intensity(zone: str) -> Optional[float]:
+    """
+    Query Electricity Maps. Without an API key the regional average is used;
+    returns None if the API request itself fails.
+    """
     api_key = os.environ.get('ELECTRICITY_MAPS_API_KEY')
     
     if not api_key:
@@ -44,7 +99,7 @@ def get_carbon_intensity(zone: str = 'US-CAL-CISO') -> Optional[float]:
         headers = {'auth-token': api_key}
         params = {'zone': zone}
         
-        response = requests.get(url, headers=headers, params=params, timeout=5)
+        response = _SESSION.get(url, headers=headers, params=params, timeout=5)
         
         if response.status_code == 200:
             data = response.json()
@@ -53,14 +108,14 @@ def get_carbon_intensity(zone: str = 'US-CAL-CISO') -> Optional[float]:
             if carbon_intensity is not None:
                 return float(carbon_intensity)
             else:
-                return get_fallback_carbon_intensity(zone)
+                return None
         else:
-            # Fallback to regional averages
-            return get_fallback_carbon_intensity(zone)
+            # Caller falls back to regional averages
+            return None
     
     except Exception:
-        # On any error, use fallback
-        return get_fallback_carbon_intensity(zone)
+        # On any error, caller uses fallback
+        return None
 
 
 def get_fallback_carbon_intensity(zone: str = 'US-CAL-CISO') -> float:
@@ -0,0 +1,34 @@
+import sys
+import os
+
+# Add prompt_compressor to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'prompt_compressor'))
+from core.smart_reduction import compress_fast
+
+
+def test_drops_fillers_and_removable_words():
+    assert compress_fast('Explain the difference between TCP and UDP.') == 'Explain difference between TCP and UDP.'
+    assert compress_fast('I basically need help', frozenset({'basically'})) == 'I need help'
+
+
+def test_keeps_words_glued_to_special_chars():
+    assert compress_fast('Use x.txt and a/b - then , stop .') == 'Use x.txt and a/b - then, stop.'
+    assert compress_fast('Ping the@example.com or on-call') == 'Ping the@example.com or on-call'
+
+
+def test_sentence_end_period_does_not_protect_words():
+    assert compress_fast('Tell me about it.') == 'Tell me about.'
+    assert compress_fast('Tell me about it') == 'Tell me about'
+    assert compress_fast("I don't like this... at all!!", frozenset({'like'})) == "I don't. all!"
+
+
+def test_keeps_word_before_in_word_dot():
+    assert compress_fast('Open a.txt now') == 'Open a.txt now'
+
+
+def test_keeps_in_word_dots():
+    assert compress_fast('Pi is 3.14 in the end') == 'Pi is 3.14 end'
+
+
+def test_tidies_punctuation():
+    assert compress_fast('  , hello ,, world !!') == 'Hello, world!'